@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from nntp._core import NNTP, NNTP_SSL
+from typing import TYPE_CHECKING, Any
+
 from nntp._exceptions import (
     NNTPDataError,
     NNTPError,
@@ -9,7 +10,11 @@ from nntp._exceptions import (
     NNTPReplyError,
     NNTPTemporaryError,
 )
-from nntp._helpers import decode_header
+
+if TYPE_CHECKING:
+    from nntp._async import NNTP_Async
+    from nntp._core import NNTP, NNTP_SSL
+    from nntp._helpers import decode_header
 
 __all__ = [
     "NNTP",
@@ -21,4 +26,30 @@ __all__ = [
     "NNTPDataError",
     "decode_header",
     "NNTP_SSL",
+    "NNTP_Async",
 ]
+
+# Names imported on first access, with the module they come from, so that
+# importing nntp (e.g. for the exceptions) doesn't import socket, ssl and email
+_LAZY_IMPORTS = {
+    "NNTP": "nntp._core",
+    "NNTP_SSL": "nntp._core",
+    "NNTP_Async": "nntp._async",
+    "decode_header": "nntp._helpers",
+}
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name = _LAZY_IMPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    import importlib
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
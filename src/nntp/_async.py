@@ -0,0 +1,191 @@
+"""An asyncio NNTP client, for fetching from many connections concurrently.
+
+Example:
+
+>>> async with await NNTP_Async.connect('news') as s:
+...     resp = await s.cmd('GROUP comp.lang.python')
+...     resp, lines = await s.longcmd('XOVER 5770-5821')
+
+Unlike NNTP, this class only implements the protocol level: commands are
+sent as given and responses are returned undecoded beyond the status line.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from typing import TYPE_CHECKING
+
+from typing_extensions import Self
+
+from nntp._constants import _CRLF, _MAXLINE, _RESP_LONG, NNTP_PORT, NNTP_RECV_CHUNK
+from nntp._exceptions import _RESP_ERRORS, NNTPDataError, NNTPReplyError
+from nntp._helpers import _check_line_lengths, _resp_class, _splitlines, _unstuff
+
+if TYPE_CHECKING:
+    from ssl import SSLContext
+
+    from _typeshed import Unused
+
+
+class NNTP_Async:
+    # Same as NNTP: commands and status lines are UTF-8, blocks are bytes.
+    encoding = "utf-8"
+    errors = "surrogateescape"
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Wrap an open connection; use connect() to open one."""
+        self.reader = reader
+        self.writer = writer
+        self.welcome = None
+
+    @classmethod
+    async def connect(
+        cls,
+        host: str,
+        port: int = NNTP_PORT,
+        *,
+        ssl_context: SSLContext | None = None,
+        timeout: float | None = None,
+        limit: int = NNTP_RECV_CHUNK,
+    ) -> Self:
+        """Connect to a server and read its welcome message.  Arguments:
+        - host: hostname to connect to
+        - port: port to connect to (default the standard NNTP port)
+        - ssl_context: if given, connect using SSL with this context
+        - timeout: timeout (in seconds) for establishing the connection
+        - limit: size of the stream buffer; blocks larger than this are
+                 still read, in several pieces
+        """
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port, ssl=ssl_context, limit=limit), timeout
+        )
+        nntp = cls(reader, writer)
+        try:
+            sys.audit("nntp.connect", nntp, host, port)
+            nntp.welcome = await nntp.getresp()
+        except:
+            await nntp.close()
+            raise
+        return nntp
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *args: Unused) -> None:
+        if not self.writer.is_closing():
+            try:
+                await self.quit()
+            except (OSError, EOFError):
+                pass
+            finally:
+                await self.close()
+
+    async def close(self) -> None:
+        """Close the connection without sending QUIT."""
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except OSError:
+            pass
+
+    async def putcmd(self, line: str) -> None:
+        """Send one command to the server, appending CRLF."""
+        data = line.encode(self.encoding, self.errors)
+        sys.audit("nntp.putline", self, data)
+        self.writer.write(data + _CRLF)
+        await self.writer.drain()
+
+    async def readline(self) -> bytes:
+        """Return one line from the server, without its line ending.
+        Raise EOFError if the connection is closed."""
+        try:
+            line = await self.reader.readline()
+        except ValueError:
+            # Longer than the stream buffer
+            raise NNTPDataError("line too long") from None
+        if not line:
+            raise EOFError
+        if len(line) > _MAXLINE:
+            raise NNTPDataError("line too long")
+        if line[-2:] == _CRLF:
+            return line[:-2]
+        return line[:-1] if line[-1:] == b"\n" else line
+
+    async def getresp(self, long: bool = False) -> str:
+        """Read a response line from the server.
+        Raise various errors if the response indicates an error, or if
+        `long` is true and the response isn't followed by a block."""
+        resp = await self.readline()
+        resp_class = _resp_class(resp)
+        if resp_class != _RESP_LONG:
+            if resp_class:
+                raise _RESP_ERRORS[resp_class](resp.decode(self.encoding, self.errors))
+            if long:
+                raise NNTPReplyError(resp.decode(self.encoding, self.errors))
+        return resp.decode(self.encoding, self.errors)
+
+    async def _readuntil(self, separator: bytes) -> bytes:
+        """Internal: read up to and including `separator`, even if that is
+        more than the stream buffer can hold."""
+        reader = self.reader
+        parts = []
+        while True:
+            try:
+                parts.append(await reader.readuntil(separator))
+                return b"".join(parts)
+            except asyncio.LimitOverrunError as e:
+                # e.consumed bytes can't contain the start of the separator
+                parts.append(await reader.readexactly(e.consumed))
+            except asyncio.IncompleteReadError:
+                raise EOFError from None
+
+    async def read_multiline(self) -> list[bytes]:
+        """Read the block following a response, up to the terminating line.
+        Returns a list of bytes objects, without line endings and
+        dot-stuffing."""
+        reader = self.reader
+        parts = []
+        try:
+            head = await reader.readexactly(1)
+            while head == b"\n":
+                # Empty first lines, ending with a bare LF
+                parts.append(head)
+                head = await reader.readexactly(1)
+            if head != b".":
+                parts.append(head)
+                parts.append((await self._readuntil(b"\n."))[:-1])
+            # At a line starting with "." - the terminating line, with a
+            # CRLF or LF ending alike, or else a dot-stuffed line
+            while True:
+                after = await reader.readexactly(1)
+                if after == b"\r":
+                    after += await reader.readexactly(1)
+                if after == b"\n" or after == _CRLF:
+                    break
+                parts.append(b"." + after)
+                parts.append((await self._readuntil(b"\n."))[:-1])
+        except asyncio.IncompleteReadError:
+            raise EOFError from None
+        block = b"".join(parts)
+        _check_line_lengths(block, 0, len(block))
+        return _splitlines(_unstuff(block))
+
+    async def cmd(self, line: str) -> str:
+        """Send a command and return the response line."""
+        await self.putcmd(line)
+        return await self.getresp()
+
+    async def longcmd(self, line: str) -> tuple[str, list[bytes]]:
+        """Send a command and return a (response, lines) tuple, where
+        `lines` is the block following the response."""
+        await self.putcmd(line)
+        resp = await self.getresp(long=True)
+        return resp, await self.read_multiline()
+
+    async def quit(self) -> str:
+        """Send a QUIT command and close the connection."""
+        try:
+            return await self.cmd("QUIT")
+        finally:
+            await self.close()
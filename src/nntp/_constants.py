@@ -6,28 +6,66 @@ from __future__ import annotations
 # the safe side.
 _MAXLINE = 2048
 
+# Number of bytes requested from the socket at once (by default, and the
+# allowed range). Lines are sliced out of the receive buffer, so that a
+# multi-line response costs one recv() call per chunk rather than one per line.
+NNTP_RECV_CHUNK = 256 * 1024
+NNTP_RECV_CHUNK_MIN = 4 * 1024
+NNTP_RECV_CHUNK_MAX = 16 * 1024 * 1024
+
+# Terminating line of a multi-line block, with the line ending before it
+_TERMINATOR = b"\r\n.\r\n"
+
 # Standard port used by NNTP servers
 NNTP_PORT = 119
 NNTP_SSL_PORT = 563
 
 # Response numbers that are followed by additional text (e.g. article)
-_LONGRESP = {
-    "100",  # HELP
-    "101",  # CAPABILITIES
-    "211",  # LISTGROUP   (also not multi-line with GROUP)
-    "215",  # LIST
-    "220",  # ARTICLE
-    "221",  # HEAD, XHDR
-    "222",  # BODY
-    "224",  # OVER, XOVER
-    "225",  # HDR
-    "230",  # NEWNEWS
-    "231",  # NEWGROUPS
-    "282",  # XGTITLE
-}
+_LONGRESP = frozenset(
+    {
+        b"100",  # HELP
+        b"101",  # CAPABILITIES
+        b"211",  # LISTGROUP   (also not multi-line with GROUP)
+        b"215",  # LIST
+        b"220",  # ARTICLE
+        b"221",  # HEAD, XHDR
+        b"222",  # BODY
+        b"224",  # OVER, XOVER
+        b"225",  # HDR
+        b"230",  # NEWNEWS
+        b"231",  # NEWGROUPS
+        b"282",  # XGTITLE
+    }
+)
+
+# The same response numbers as integers
+_LONGRESP_INT = frozenset(map(int, _LONGRESP))
+
+# Classes of responses: success, success followed by additional text,
+# temporary error, permanent error and invalid response
+_RESP_OK = 0
+_RESP_LONG = 1
+_RESP_TEMP_ERR = 2
+_RESP_PERM_ERR = 3
+_RESP_PROTO_ERR = 4
+
+# Class of a response by its first digit, and by its response number
+_DIGIT_CLASS = (
+    _RESP_PROTO_ERR,
+    _RESP_OK,
+    _RESP_OK,
+    _RESP_OK,
+    _RESP_TEMP_ERR,
+    _RESP_PERM_ERR,
+    _RESP_PROTO_ERR,
+    _RESP_PROTO_ERR,
+    _RESP_PROTO_ERR,
+    _RESP_PROTO_ERR,
+)
+_CODE_CLASS = bytes(_RESP_LONG if code in _LONGRESP_INT else _DIGIT_CLASS[code // 100] for code in range(1000))
 
 # Default decoded value for LIST OVERVIEW.FMT if not supported
-_DEFAULT_OVERVIEW_FMT = [
+_DEFAULT_OVERVIEW_FMT = (
     "subject",
     "from",
     "date",
@@ -35,13 +73,14 @@ _DEFAULT_OVERVIEW_FMT = [
     "references",
     ":bytes",
     ":lines",
-]
+)
 
 # Alternative names allowed in LIST OVERVIEW.FMT response
 _OVERVIEW_FMT_ALTERNATIVES = {
     "bytes": ":bytes",
     "lines": ":lines",
 }
+_OVERVIEW_FMT_NORMALIZE = _OVERVIEW_FMT_ALTERNATIVES.get
 
 # Line terminators (we always output CRLF, but accept any of CRLF, CR, LF)
 _CRLF = b"\r\n"
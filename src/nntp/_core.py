@@ -53,6 +53,8 @@ are strings, not numbers, since they are rarely used for calculations.
 # - automatic querying of capabilities at connect
 # - New method NNTP.getcapabilities()
 # - New method NNTP.over()
+# - New method NNTP.pipeline()
+# - New class NNTP_Async, an asyncio client
 # - New helper function decode_header()
 # - NNTP.post() and NNTP.ihave() accept file objects, bytes-like objects and
 #   arbitrary iterables yielding lines.
@@ -67,15 +69,26 @@ import datetime
 import re
 import socket
 import sys
+import threading
 from collections.abc import Iterable
 from typing import TYPE_CHECKING, Any
 
 from typing_extensions import Self
 
-from nntp._constants import _CRLF, _DEFAULT_OVERVIEW_FMT, _LONGRESP, _MAXLINE, NNTP_PORT, NNTP_SSL_PORT
+from nntp._constants import (
+    _CRLF,
+    _DEFAULT_OVERVIEW_FMT,
+    _RESP_LONG,
+    NNTP_PORT,
+    NNTP_RECV_CHUNK,
+    NNTP_RECV_CHUNK_MAX,
+    NNTP_RECV_CHUNK_MIN,
+    NNTP_SSL_PORT,
+)
 
 # from socket import _GLOBAL_DEFAULT_TIMEOUT
 from nntp._exceptions import (
+    _RESP_ERRORS,
     NNTPDataError,
     NNTPError,
     NNTPPermanentError,
@@ -84,17 +97,24 @@ from nntp._exceptions import (
     NNTPTemporaryError,
 )
 from nntp._helpers import (
+    _compile_overview_fmt,
+    _default_ssl_context,
     _encrypt_on,
+    _get_netrc,
+    _LineReader,
     _parse_datetime,
     _parse_overview,
     _parse_overview_fmt,
+    _resp_class,
+    _splitlines,
     _unparse_datetime,
+    _unstuff,
     decode_header,
 )
 from nntp._types import ArticleInfo, File, GroupInfo
 
 if TYPE_CHECKING:
-    from ssl import SSLContext, SSLSocket
+    from ssl import SSLContext, SSLSession, SSLSocket
 
     from _typeshed import Unused
 
@@ -109,6 +129,10 @@ __all__ = [
     "decode_header",
 ]
 
+# Lines of LIST NEWSGROUPS / XGTITLE and XHDR responses
+_DESCRIPTION_LINE_MATCH = re.compile("([^ \t]+)[ \t]+(.*)$").match
+_XHDR_LINE_MATCH = re.compile("^([0-9]+) ?(.*)\n?").match
+
 
 # The classes themselves
 class NNTP:
@@ -127,6 +151,13 @@ class NNTP:
     encoding: str = "utf-8"
     errors: str = "surrogateescape"
 
+    # Overview formats shared by all instances, so that new connections to a
+    # known server don't ask for it again. Keyed by (host, port,
+    # implementation, version), and only filled for servers which advertise
+    # their implementation.
+    _overview_fmt_cache: dict[tuple[str, int, str, int], list[str]] = {}
+    _overview_fmt_lock = threading.Lock()
+
     def __init__(
         self,
         host: str,
@@ -136,6 +167,11 @@ class NNTP:
         readermode: bool | None = None,
         usenetrc: bool = False,
         timeout: float | None = None,
+        *,
+        nodelay: bool = True,
+        rcvbuf: int | None = None,
+        sndbuf: int | None = None,
+        chunk_size: int = NNTP_RECV_CHUNK,
     ):
         """Initialize an instance.  Arguments:
         - host: hostname to connect to
@@ -146,7 +182,18 @@ class NNTP:
                       connecting.
         - usenetrc: allow loading username and password from ~/.netrc file
                     if not specified explicitly
-        - timeout: timeout (in seconds) used for socket connections
+        - timeout: timeout (in seconds) used for socket connections; on
+                   Linux, it also applies to unacknowledged sent data
+                   (TCP_USER_TIMEOUT)
+        - nodelay: disable Nagle's algorithm (TCP_NODELAY), so that commands
+                   are sent without delay
+        - rcvbuf, sndbuf: size of the socket receive and send buffers
+                          (SO_RCVBUF, SO_SNDBUF); by default the operating
+                          system sizes them automatically
+        - chunk_size: number of bytes to receive from the socket at once
+                      (default 256 KiB); on links with a high
+                      bandwidth-delay product, raising it pays off best
+                      together with a larger rcvbuf
 
         readermode is sometimes necessary if you are connecting to an
         NNTP server on the local machine and intend to call
@@ -154,18 +201,26 @@ class NNTP:
         unexpected NNTPPermanentErrors, you might need to set
         readermode.
         """
+        if not NNTP_RECV_CHUNK_MIN <= chunk_size <= NNTP_RECV_CHUNK_MAX:
+            raise ValueError(
+                f"chunk_size must be between {NNTP_RECV_CHUNK_MIN} and {NNTP_RECV_CHUNK_MAX}, not {chunk_size}"
+            )
         self.host = host
         self.port = port
+        self.chunk_size = chunk_size
+        self.nodelay = nodelay
+        self.rcvbuf = rcvbuf
+        self.sndbuf = sndbuf
         self.sock = self._create_socket(timeout)
-        self.file = None
         try:
-            self.file = self.sock.makefile("rwb")
+            # Data is sent and received directly on the socket, without the
+            # extra copy through the buffers of a socket.makefile() object
+            self._sendall = self.sock.sendall
+            self._reader = _LineReader(self.sock.recv_into, self.chunk_size)
             self._base_init(readermode)
             if user or usenetrc:
                 self.login(user, password, usenetrc)
         except:
-            if self.file:
-                self.file.close()
             self.sock.close()
             raise
 
@@ -188,7 +243,7 @@ class NNTP:
         # after performing its normal function.
         # Enable only if we're not already in READER mode anyway.
         self.readermode_afterauth = False
-        if readermode and "READER" not in self._caps:
+        if readermode and "READER" not in self._caps_set:
             self._setreadermode()
             if not self.readermode_afterauth:
                 # Capabilities might have changed after MODE READER
@@ -207,7 +262,7 @@ class NNTP:
         return self
 
     def __exit__(self, *args: Unused) -> None:
-        is_connected = lambda: hasattr(self, "file")  # noqa: E731
+        is_connected = lambda: hasattr(self, "_sendall")  # noqa: E731
         if is_connected():
             try:
                 self.quit()
@@ -221,7 +276,24 @@ class NNTP:
         if timeout is not None and not timeout:
             raise ValueError("Non-blocking socket (timeout=0) is not supported")
         sys.audit("nntp.connect", self, self.host, self.port)
-        return socket.create_connection((self.host, self.port), timeout)
+        sock = socket.create_connection((self.host, self.port), timeout)
+        try:
+            if self.nodelay:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            # Also give up on unacknowledged data after the timeout (Linux),
+            # so that a dead connection is noticed while sending too
+            if timeout is not None and hasattr(socket, "TCP_USER_TIMEOUT"):
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_USER_TIMEOUT, int(timeout * 1000))
+            # Setting the buffer sizes disables their automatic tuning (on
+            # Linux at least), so leave them alone unless asked to.
+            if self.rcvbuf is not None:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.rcvbuf)
+            if self.sndbuf is not None:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.sndbuf)
+        except:
+            sock.close()
+            raise
+        return sock
 
     def getwelcome(self) -> str:
         """Get the welcome message from the server
@@ -245,8 +317,11 @@ class NNTP:
             except (NNTPPermanentError, NNTPTemporaryError):
                 # Server doesn't support capabilities
                 self._caps = {}
+                self._caps_set = frozenset()
             else:
                 self._caps = caps
+                # Capability labels are case-insensitive (RFC 3977 3.3.1)
+                self._caps_set = frozenset(name.upper() for name in caps)
                 if "VERSION" in caps:
                     # The server can advertise several supported versions,
                     # choose the highest.
@@ -265,6 +340,51 @@ class NNTP:
 
     debug = set_debuglevel
 
+    def pipeline(self) -> _Pipeline:
+        """Return a context manager queueing commands, which are sent to the
+        server in a single write when the `with` block exits. The responses
+        are then read in order and stored in its `responses` list: a
+        response string for commands queued with shortcmd(), a
+        (response, list of lines) tuple for those queued with longcmd(), or
+        the NNTPError raised for the command.
+
+        Commands in a pipeline must not depend on each other's return
+        values (cf. RFC 3977, section 3.5).
+
+        >>> with s.pipeline() as p:
+        ...     for message_id in message_ids:
+        ...         p.longcmd('BODY ' + message_id)
+        >>> resp, lines = p.responses[0]
+        """
+        return _Pipeline(self)
+
+    def _pipeline(self, commands: list[tuple[str, bool]]) -> list[Any]:
+        """Internal: send several commands at once and get their responses.
+        `commands` is a list of (line, is_long) tuples."""
+        data = []
+        debugging = self.debugging
+        encoding, errors = self.encoding, self.errors
+        for line, _ in commands:
+            if debugging:
+                print("*cmd*", repr(line))
+            line = line.encode(encoding, errors)
+            sys.audit("nntp.putline", self, line)
+            data.append(line + _CRLF)
+        data = b"".join(data)
+        if debugging > 1:
+            print("*put*", repr(data))
+        self._sendall(data)
+        responses = []
+        append = responses.append
+        getlongresp, getresp = self._getlongresp, self._getresp
+        for _, is_long in commands:
+            try:
+                append(getlongresp() if is_long else getresp())
+            except NNTPError as e:
+                # Keep reading: the following responses are already on their way
+                append(e)
+        return responses
+
     def _putline(self, line: bytes) -> None:
         """Internal: send one line to the server, appending CRLF.
         The `line` must be a bytes-like object."""
@@ -272,8 +392,7 @@ class NNTP:
         line = line + _CRLF
         if self.debugging > 1:
             print("*put*", repr(line))
-        self.file.write(line)
-        self.file.flush()
+        self._sendall(line)
 
     def _putcmd(self, line: str) -> None:
         """Internal: send one command to the server (through _putline()).
@@ -287,44 +406,49 @@ class NNTP:
         """Internal: return one line from the server, stripping _CRLF.
         Raise EOFError if the connection is closed.
         Returns a bytes object."""
-        line = self.file.readline(_MAXLINE + 1)
-        if len(line) > _MAXLINE:
-            raise NNTPDataError("line too long")
-        if self.debugging > 1:
-            print("*get*", repr(line))
-        if not line:
-            raise EOFError
+        if self.debugging < 2:
+            return self._reader.readline(strip_crlf)
+        line = self._reader.readline()
+        print("*get*", repr(line))
         if strip_crlf:
-            if line[-2:] == _CRLF:
+            if line.endswith(_CRLF):
                 line = line[:-2]
-            elif line[-1:] in _CRLF:
+            elif line.endswith((b"\n", b"\r")):
                 line = line[:-1]
         return line
 
-    def _getresp(self) -> str:
+    def _getresp_bytes(self, long: bool = False) -> bytes:
         """Internal: get a response from the server.
-        Raise various errors if the response indicates an error.
-        Returns a unicode string."""
+        Raise various errors if the response indicates an error, or if
+        `long` is true and the response isn't followed by additional text.
+        Returns the raw bytes object; it is only decoded when an error
+        is raised."""
         resp = self._getline()
         if self.debugging:
             print("*resp*", repr(resp))
-        resp = resp.decode(self.encoding, self.errors)
-        c = resp[:1]
-        if c == "4":
-            raise NNTPTemporaryError(resp)
-        if c == "5":
-            raise NNTPPermanentError(resp)
-        if c not in "123":
-            raise NNTPProtocolError(resp)
+        resp_class = _resp_class(resp)
+        if resp_class != _RESP_LONG:
+            if resp_class:
+                raise _RESP_ERRORS[resp_class](resp.decode(self.encoding, self.errors))
+            if long:
+                raise NNTPReplyError(resp.decode(self.encoding, self.errors))
         return resp
 
-    def _getlongresp(self, file: File = None) -> tuple[str, list[bytes]]:
+    def _getresp(self) -> str:
+        """Internal: get a response from the server.
+        Raise various errors if the response indicates an error.
+        Returns a unicode string."""
+        return self._getresp_bytes().decode(self.encoding, self.errors)
+
+    def _getlongblock(self, file: File = None) -> tuple[str, bytes]:
         """Internal: get a response plus following text from the server.
         Raise various errors if the response indicates an error.
 
-        Returns a (response, lines) tuple where `response` is a unicode
-        string and `lines` is a list of bytes objects.
-        If `file` is a file-like object, it must be open in binary mode.
+        Returns a (response, block) tuple where `response` is a unicode
+        string and `block` is a bytes object holding the lines of text,
+        dot-stuffing removed. If `file` is given, the lines are written to
+        it instead and `block` is empty; a file-like object must be open in
+        binary mode.
         """
 
         openedFile = None
@@ -333,36 +457,39 @@ class NNTP:
             if isinstance(file, (str, bytes)):
                 openedFile = file = open(file, "wb")
 
-            resp = self._getresp()
-            if resp[:3] not in _LONGRESP:
-                raise NNTPReplyError(resp)
+            resp = self._getresp_bytes(long=True)
 
-            lines = []
-            if file is not None:
-                # XXX lines = None instead?
-                terminators = (b"." + _CRLF, b".\n")
-                while 1:
-                    line = self._getline(False)
-                    if line in terminators:
-                        break
-                    if line.startswith(b".."):
-                        line = line[1:]
-                    file.write(line)
+            if file is None:
+                block = _unstuff(self._reader.readblock())
+                if self.debugging > 1:
+                    print("*get*", repr(block))
             else:
-                terminator = b"."
-                while 1:
-                    line = self._getline()
-                    if line == terminator:
-                        break
-                    if line.startswith(b".."):
-                        line = line[1:]
-                    lines.append(line)
+                # Write the lines as they arrive, so that large articles
+                # don't have to fit in memory
+                for block in self._reader.iterblock():
+                    block = _unstuff(block)
+                    if self.debugging > 1:
+                        print("*get*", repr(block))
+                    file.write(block)
+                block = b""
         finally:
             # If this method created the file, then it must close it
             if openedFile:
                 openedFile.close()
 
-        return resp, lines
+        return resp.decode(self.encoding, self.errors), block
+
+    def _getlongresp(self, file: File = None) -> tuple[str, list[bytes]]:
+        """Internal: get a response plus following text from the server.
+        Raise various errors if the response indicates an error.
+
+        Returns a (response, lines) tuple where `response` is a unicode
+        string and `lines` is a list of bytes objects.
+        If `file` is a file-like object, it must be open in binary mode.
+        """
+        resp, block = self._getlongblock(file)
+        # XXX lines = None instead (when writing to a file)?
+        return resp, _splitlines(block)
 
     def _shortcmd(self, line: str) -> str:
         """Internal: send a command and get the response.
@@ -370,6 +497,14 @@ class NNTP:
         self._putcmd(line)
         return self._getresp()
 
+    def _shortcmd_bytes(self, line: bytes) -> str:
+        """Internal: same as _shortcmd(), for a command already encoded to
+        bytes."""
+        if self.debugging:
+            print("*cmd*", repr(line))
+        self._putline(line)
+        return self._getresp()
+
     def _longcmd(self, line: str, file: File = None) -> tuple[str, list[bytes]]:
         """Internal: send a command and get the response plus following text.
         Same return value as _getlongresp()."""
@@ -382,8 +517,10 @@ class NNTP:
         are unicode strings rather than bytes objects.
         """
         self._putcmd(line)
-        resp, list = self._getlongresp(file)
-        return resp, [line.decode(self.encoding, self.errors) for line in list]
+        resp, block = self._getlongblock(file)
+        # Decoding the whole block at once is much faster than line by line,
+        # and there is no list of bytes objects in between
+        return resp, _splitlines(block.decode(self.encoding, self.errors))
 
     def _getoverviewfmt(self) -> list[str]:
         """Internal: get the overview format. Queries the server if not
@@ -392,19 +529,42 @@ class NNTP:
             return self._cachedoverviewfmt
         except AttributeError:
             pass
+        key = None
+        if self.nntp_implementation is not None:
+            key = (self.host, self.port, self.nntp_implementation, self.nntp_version)
+            with self._overview_fmt_lock:
+                fmt = self._overview_fmt_cache.get(key)
+            if fmt is not None:
+                self._cachedoverviewfmt = fmt
+                return fmt
         try:
             resp, lines = self._longcmdstring("LIST OVERVIEW.FMT")
         except NNTPPermanentError:
             # Not supported by server?
-            fmt = _DEFAULT_OVERVIEW_FMT[:]
+            fmt = list(_DEFAULT_OVERVIEW_FMT)
         else:
             fmt = _parse_overview_fmt(lines)
+        if key is not None:
+            with self._overview_fmt_lock:
+                self._overview_fmt_cache[key] = fmt
         self._cachedoverviewfmt = fmt
         return fmt
 
+    def _getoverviewschema(self) -> tuple[list[str], tuple[tuple[int, str, str, int], ...]]:
+        """Internal: get the overview format and its compiled form for
+        _parse_overview, compiling it once per connection."""
+        try:
+            return self._cachedoverviewschema
+        except AttributeError:
+            pass
+        fmt = self._getoverviewfmt()
+        self._cachedoverviewschema = fmt, _compile_overview_fmt(fmt)
+        return self._cachedoverviewschema
+
     def _grouplist(self, lines: list[str]) -> list[GroupInfo]:
         # Parse lines into "group last first flag"
-        return [GroupInfo(*line.split()) for line in lines]
+        make = GroupInfo._make
+        return [make(line.split()) for line in lines]
 
     def capabilities(self) -> tuple[str, dict[str, list[str]]]:
         """Process a CAPABILITIES command.  Not supported by all servers.
@@ -427,12 +587,10 @@ class NNTP:
         - resp: server response if successful
         - list: list of newsgroup names
         """
-        if not isinstance(date, (datetime.date, datetime.date)):
-            raise TypeError(
-                "the date parameter must be a date or datetime object, " "not '{:40}'".format(date.__class__.__name__)
-            )
+        if not isinstance(date, datetime.date):
+            raise TypeError(f"the date parameter must be a date or datetime object, not '{type(date).__name__:40}'")
         date_str, time_str = _unparse_datetime(date, self.nntp_version < 2)
-        cmd = "NEWGROUPS {0} {1}".format(date_str, time_str)
+        cmd = f"NEWGROUPS {date_str} {time_str}"
         resp, lines = self._longcmdstring(cmd, file)
         return resp, self._grouplist(lines)
 
@@ -446,12 +604,10 @@ class NNTP:
         - resp: server response if successful
         - list: list of message ids
         """
-        if not isinstance(date, (datetime.date, datetime.date)):
-            raise TypeError(
-                "the date parameter must be a date or datetime object, " "not '{:40}'".format(date.__class__.__name__)
-            )
+        if not isinstance(date, datetime.date):
+            raise TypeError(f"the date parameter must be a date or datetime object, not '{type(date).__name__:40}'")
         date_str, time_str = _unparse_datetime(date, self.nntp_version < 2)
-        cmd = "NEWNEWS {0} {1} {2}".format(group, date_str, time_str)
+        cmd = f"NEWNEWS {group} {date_str} {time_str}"
         return self._longcmdstring(cmd, file)
 
     def list(self, group_pattern: str | None = None, *, file: File = None) -> tuple[str, list[str]]:
@@ -470,7 +626,6 @@ class NNTP:
         return resp, self._grouplist(lines)
 
     def _getdescriptions(self, group_pattern: str, return_all: bool) -> tuple[str, dict[str, Any]] | str:
-        line_pat = re.compile("^(?P<group>[^ \t]+)[ \t]+(.*)$")
         # Try the more std (acc. to RFC2980) LIST NEWSGROUPS first
         resp, lines = self._longcmdstring("LIST NEWSGROUPS " + group_pattern)
         if not resp.startswith("215"):
@@ -480,7 +635,7 @@ class NNTP:
             resp, lines = self._longcmdstring("XGTITLE " + group_pattern)
         groups = {}
         for raw_line in lines:
-            match = line_pat.search(raw_line.strip())
+            match = _DESCRIPTION_LINE_MATCH(raw_line.strip())
             if match:
                 name, desc = match.group(1, 2)
                 if not return_all:
@@ -570,7 +725,7 @@ class NNTP:
         - message_id: the message id
         """
         if message_spec:
-            return self._statcmd("STAT {0}".format(message_spec))
+            return self._statcmd(f"STAT {message_spec}")
         else:
             return self._statcmd("STAT")
 
@@ -597,7 +752,7 @@ class NNTP:
         - ArticleInfo: (article number, message id, list of header lines)
         """
         if message_spec is not None:
-            cmd = "HEAD {0}".format(message_spec)
+            cmd = f"HEAD {message_spec}"
         else:
             cmd = "HEAD"
         return self._artcmd(cmd, file)
@@ -611,7 +766,7 @@ class NNTP:
         - ArticleInfo: (article number, message id, list of body lines)
         """
         if message_spec is not None:
-            cmd = "BODY {0}".format(message_spec)
+            cmd = f"BODY {message_spec}"
         else:
             cmd = "BODY"
         return self._artcmd(cmd, file)
@@ -625,7 +780,7 @@ class NNTP:
         - ArticleInfo: (article number, message id, list of article lines)
         """
         if message_spec is not None:
-            cmd = "ARTICLE {0}".format(message_spec)
+            cmd = f"ARTICLE {message_spec}"
         else:
             cmd = "ARTICLE"
         return self._artcmd(cmd, file)
@@ -645,11 +800,14 @@ class NNTP:
         - resp: server response if successful
         - list: list of (nr, value) strings
         """
-        pat = re.compile("^([0-9]+) ?(.*)\n?")
-        resp, lines = self._longcmdstring("XHDR {0} {1}".format(hdr, str), file)
+        resp, lines = self._longcmdstring(f"XHDR {hdr} {str}", file)
 
         def remove_number(line: str) -> str:
-            m = pat.match(line)
+            # Usually "<number> <value>", which doesn't need the regex
+            number, _, value = line.partition(" ")
+            if number.isdigit() and number.isascii():
+                return number, value
+            m = _XHDR_LINE_MATCH(line)
             return m.group(1, 2) if m else line
 
         return resp, [remove_number(line) for line in lines]
@@ -663,9 +821,8 @@ class NNTP:
         - resp: server response if successful
         - list: list of dicts containing the response fields
         """
-        resp, lines = self._longcmdstring("XOVER {0}-{1}".format(start, end), file)
-        fmt = self._getoverviewfmt()
-        return resp, _parse_overview(lines, fmt)
+        resp, lines = self._longcmdstring(f"XOVER {start}-{end}", file)
+        return resp, _parse_overview(lines, *self._getoverviewschema())
 
     def over(
         self, message_spec: None | str | list[Any] | tuple[Any, ...], *, file: File = None
@@ -686,15 +843,14 @@ class NNTP:
 
         NOTE: the "message id" form isn't supported by XOVER
         """
-        cmd = "OVER" if "OVER" in self._caps else "XOVER"
+        cmd = "OVER" if "OVER" in self._caps_set else "XOVER"
         if isinstance(message_spec, (tuple, list)):
             start, end = message_spec
-            cmd += " {0}-{1}".format(start, end or "")
+            cmd += f" {start}-{end or ''}"
         elif message_spec is not None:
             cmd = cmd + " " + message_spec
         resp, lines = self._longcmdstring(cmd, file)
-        fmt = self._getoverviewfmt()
-        return resp, _parse_overview(lines, fmt)
+        return resp, _parse_overview(lines, *self._getoverviewschema())
 
     def date(self) -> tuple[str, datetime.datetime]:
         """Process the DATE command.
@@ -702,36 +858,46 @@ class NNTP:
         - resp: server response if successful
         - date: datetime object
         """
-        resp = self._shortcmd("DATE")
-        if not resp.startswith("111"):
+        self._putcmd("DATE")
+        # The timestamp is parsed from the raw bytes, without decoding it
+        raw_resp = self._getresp_bytes()
+        resp = raw_resp.decode(self.encoding, self.errors)
+        if not raw_resp.startswith(b"111"):
             raise NNTPReplyError(resp)
-        elem = resp.split()
+        elem = raw_resp.split()
         if len(elem) != 2:
             raise NNTPDataError(resp)
         date = elem[1]
         if len(date) != 14:
             raise NNTPDataError(resp)
-        return resp, _parse_datetime(date, None)
+        return resp, _parse_datetime(date)
 
     def _post(self, command: str, f: bytes | bytearray) -> str:
         resp = self._shortcmd(command)
         # Raises a specific exception if posting is not allowed
         if not resp.startswith("3"):
             raise NNTPReplyError(resp)
+        # The whole article is sent with a single write, rather than
+        # through _putline() (which would flush after every line)
+        buf = bytearray()
         if isinstance(f, (bytes, bytearray)):
-            f = f.splitlines()
-        # We don't use _putline() because:
-        # - we don't want additional CRLF if the file or iterable is already
-        #   in the right format
-        # - we don't want a spurious flush() after each line is written
-        for line in f:
-            if not line.endswith(_CRLF):
-                line = line.rstrip(b"\r\n") + _CRLF
-            if line.startswith(b"."):
-                line = b"." + line
-            self.file.write(line)
-        self.file.write(b".\r\n")
-        self.file.flush()
+            # Normalize the line endings to CRLF and dot-stuff the lines in bulk
+            lines = f.splitlines()
+            if lines:
+                if lines[0].startswith(b"."):
+                    buf += b"."
+                buf += b"\r\n".join(lines).replace(b"\r\n.", b"\r\n..")
+                buf += _CRLF
+        else:
+            for line in f:
+                # Lines already ending with CRLF are kept as they are
+                if not line.endswith(_CRLF):
+                    line = line.rstrip(b"\r\n") + _CRLF
+                if line.startswith(b"."):
+                    buf += b"."
+                buf += line
+        buf += b".\r\n"
+        self._sendall(buf)
         return self._getresp()
 
     def post(self, data: bytes | Iterable[bytes]) -> str:
@@ -748,13 +914,12 @@ class NNTP:
         Returns:
         - resp: server response if successful
         Note that if the server refuses the article an exception is raised."""
-        return self._post("IHAVE {0}".format(message_id), data)
+        return self._post(f"IHAVE {message_id}", data)
 
     def _close(self) -> None:
         try:
-            if self.file:
-                self.file.close()
-                del self.file
+            # Marks the connection as closed
+            del self._sendall
         finally:
             self.sock.close()
 
@@ -777,9 +942,7 @@ class NNTP:
         # Presume that if .netrc has an entry, NNRP authentication is required.
         try:
             if usenetrc and not user:
-                import netrc
-
-                credentials = netrc.netrc()
+                credentials = _get_netrc()
                 auth = credentials.authenticators(self.host)
                 if auth:
                     user = auth[0]
@@ -789,12 +952,12 @@ class NNTP:
         # Perform NNTP authentication if needed.
         if not user:
             return
-        resp = self._shortcmd("authinfo user " + user)
+        resp = self._shortcmd_bytes(b"authinfo user " + user.encode(self.encoding, self.errors))
         if resp.startswith("381"):
             if not password:
                 raise NNTPReplyError(resp)
             else:
-                resp = self._shortcmd("authinfo pass " + password)
+                resp = self._shortcmd_bytes(b"authinfo pass " + password.encode(self.encoding, self.errors))
                 if not resp.startswith("281"):
                     raise NNTPPermanentError(resp)
         # Capabilities might have changed after login
@@ -802,7 +965,7 @@ class NNTP:
         self.getcapabilities()
         # Attempt to send mode reader if it was requested after login.
         # Only do so if we're not in reader mode already.
-        if self.readermode_afterauth and "READER" not in self._caps:
+        if self.readermode_afterauth and "READER" not in self._caps_set:
             self._setreadermode()
             # Capabilities might have changed after MODE READER
             self._caps = None
@@ -810,7 +973,7 @@ class NNTP:
 
     def _setreadermode(self) -> None:
         try:
-            self.welcome = self._shortcmd("mode reader")
+            self.welcome = self._shortcmd_bytes(b"mode reader")
         except NNTPPermanentError:
             # Error 5xx, probably 'not implemented'
             pass
@@ -833,9 +996,9 @@ class NNTP:
             raise ValueError("TLS cannot be started after authentication.")
         resp = self._shortcmd("STARTTLS")
         if resp.startswith("382"):
-            self.file.close()
             self.sock = _encrypt_on(self.sock, context, self.host)
-            self.file = self.sock.makefile("rwb")
+            self._sendall = self.sock.sendall
+            self._reader = _LineReader(self.sock.recv_into, self.chunk_size)
             self.tls_on = True
             # Capabilities may change after TLS starts up, so ask for them
             # again.
@@ -845,7 +1008,37 @@ class NNTP:
             raise NNTPError("TLS failed to start.")
 
 
+class _Pipeline:
+    """Commands to send in a single write, see NNTP.pipeline()."""
+
+    def __init__(self, nntp: NNTP) -> None:
+        self._nntp = nntp
+        self._commands: list[tuple[str, bool]] = []
+        self.responses: list[Any] = []
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, *args: Unused) -> None:
+        if exc_type is None and self._commands:
+            self.responses = self._nntp._pipeline(self._commands)
+
+    def shortcmd(self, line: str) -> None:
+        """Queue a command answered by a single response line."""
+        self._commands.append((line, False))
+
+    def longcmd(self, line: str) -> None:
+        """Queue a command answered by a response line and a block of text."""
+        self._commands.append((line, True))
+
+
 class NNTP_SSL(NNTP):
+    # TLS session of the last connection to each (host, port), with the
+    # context it was made with, so that the next connection using the same
+    # context resumes it instead of doing a full handshake.
+    _tls_sessions: dict[tuple[str, int], tuple[SSLContext, SSLSession]] = {}
+    _tls_sessions_lock = threading.Lock()
+
     def __init__(
         self,
         host: str,
@@ -856,17 +1049,49 @@ class NNTP_SSL(NNTP):
         readermode: bool | None = None,
         usenetrc: bool = False,
         timeout: float | None = None,
+        *,
+        nodelay: bool = True,
+        rcvbuf: int | None = None,
+        sndbuf: int | None = None,
+        chunk_size: int = NNTP_RECV_CHUNK,
     ) -> None:
         """This works identically to NNTP.__init__, except for the change
         in default port and the `ssl_context` argument for SSL connections.
         """
         self.ssl_context = ssl_context
-        super().__init__(host, port, user, password, readermode, usenetrc, timeout)
+        super().__init__(
+            host,
+            port,
+            user,
+            password,
+            readermode,
+            usenetrc,
+            timeout,
+            nodelay=nodelay,
+            rcvbuf=rcvbuf,
+            sndbuf=sndbuf,
+            chunk_size=chunk_size,
+        )
+        # With TLS 1.3, the session ticket is only sent after the handshake,
+        # so it is available now that the server has answered.
+        session = getattr(self.sock, "session", None)
+        if session is not None:
+            with self._tls_sessions_lock:
+                self._tls_sessions[self.host, self.port] = self._context, session
 
     def _create_socket(self, timeout: float | None) -> SSLSocket:
         sock = super()._create_socket(timeout)
+        context = self.ssl_context
+        if context is None:
+            context = _default_ssl_context()
+        self._context = context
+        with self._tls_sessions_lock:
+            cached_context, session = self._tls_sessions.get((self.host, self.port), (None, None))
+        if cached_context is not context:
+            # A session can only be resumed with the context that made it
+            session = None
         try:
-            sock = _encrypt_on(sock, self.ssl_context, self.host)
+            sock = _encrypt_on(sock, context, self.host, session)
         except:
             sock.close()
             raise
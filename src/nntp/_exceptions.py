@@ -5,29 +5,43 @@ from __future__ import annotations
 class NNTPError(Exception):
     """Base class for all nntp exceptions"""
 
+    # Keeps `response` out of a per-instance __dict__
+    __slots__ = ("response",)
+
     def __init__(self, *args: str) -> None:
         Exception.__init__(self, *args)
-        try:
-            self.response = args[0]
-        except IndexError:
-            self.response = "No response given"
+        self.response = args[0] if args else "No response given"
 
 
 class NNTPReplyError(NNTPError):
     """Unexpected [123]xx reply"""
 
+    __slots__ = ()
+
 
 class NNTPTemporaryError(NNTPError):
     """4xx errors"""
 
+    __slots__ = ()
+
 
 class NNTPPermanentError(NNTPError):
     """5xx errors"""
 
+    __slots__ = ()
+
 
 class NNTPProtocolError(NNTPError):
     """Response does not begin with [1-5]"""
 
+    __slots__ = ()
+
 
 class NNTPDataError(NNTPError):
     """Error in response data"""
+
+    __slots__ = ()
+
+
+# Exception raised for each class of response (see _constants._RESP_*)
+_RESP_ERRORS = (None, None, NNTPTemporaryError, NNTPPermanentError, NNTPProtocolError)
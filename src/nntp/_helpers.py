@@ -1,19 +1,77 @@
 from __future__ import annotations
 
 import datetime
+import functools
+import re
 import socket
 import ssl
+from collections.abc import Callable, Iterator
 from email.header import decode_header as _email_decode_header
-from typing import Any
+from typing import TYPE_CHECKING, Any, AnyStr
 
-from nntp._constants import _DEFAULT_OVERVIEW_FMT, _OVERVIEW_FMT_ALTERNATIVES
+from nntp._constants import (
+    _CODE_CLASS,
+    _CRLF,
+    _DEFAULT_OVERVIEW_FMT,
+    _DIGIT_CLASS,
+    _MAXLINE,
+    _OVERVIEW_FMT_NORMALIZE,
+    _RESP_OK,
+    _RESP_PROTO_ERR,
+    NNTP_RECV_CHUNK,
+)
 from nntp._exceptions import NNTPDataError
 
+if TYPE_CHECKING:
+    import netrc
+
+# fast_mail_parser is an optional, faster decoder for MIME encoded words.
+try:
+    from fast_mail_parser import ParseError as _FastParseError
+    from fast_mail_parser import parse_email as _fast_parse_email
+except ImportError:
+    _USE_FAST_PARSER = False
+else:
+    _USE_FAST_PARSER = True
+
+# Header values that fast_mail_parser decodes exactly as email.header does:
+# printable ASCII words and well-formed UTF-8 encoded words, separated by
+# single spaces. It reads other charsets as their WHATWG supersets, and leaves
+# encoded words touching other text undecoded.
+_FAST_PARSER_WORD = (
+    r"(?:=\?utf-8\?(?:q\?(?:[!-<>@-~]|=[0-9a-f]{2})*"
+    r"|b\?(?:[a-z0-9+/]{4})*(?:[a-z0-9+/]{2}==|[a-z0-9+/]{3}=)?)\?="
+    r"|(?:(?!=\?)[!-~])+)"
+)
+_FAST_PARSER_MATCH = re.compile(rf"{_FAST_PARSER_WORD}(?: {_FAST_PARSER_WORD})*", re.IGNORECASE).fullmatch
+
 
 # Helper function(s)
 def decode_header(header_str: str) -> str:
     """Takes a unicode string representing a munged header value
-    and decodes it as a (possibly non-ASCII) readable value."""
+    and decodes it as a (possibly non-ASCII) readable value.
+    Decoded encoded words are cached, as the same From and Subject
+    values come back across a newsgroup; decode_header.cache_clear()
+    empties the cache."""
+    if "=?" not in header_str:
+        # No MIME encoded word, nothing to decode
+        return header_str
+    return _decode_encoded_words(header_str)
+
+
+@functools.lru_cache(maxsize=4096)
+def _decode_encoded_words(header_str: str) -> str:
+    """Decode a header value containing MIME encoded words."""
+    if _USE_FAST_PARSER and _FAST_PARSER_MATCH(header_str):
+        message = b"Subject: " + header_str.encode("ascii") + b"\r\n\r\n"
+        try:
+            decoded = _fast_parse_email(message).subject
+        except _FastParseError:
+            pass
+        else:
+            # U+FFFD stands for invalid UTF-8, on which the stdlib raises
+            if "\ufffd" not in decoded:
+                return decoded
     parts = []
     for v, enc in _email_decode_header(header_str):
         if isinstance(v, bytes):
@@ -23,6 +81,48 @@ def decode_header(header_str: str) -> str:
     return "".join(parts)
 
 
+# The cache hooks of the decorated function, on the public one
+decode_header.cache_clear = _decode_encoded_words.cache_clear  # type: ignore[attr-defined]
+decode_header.cache_info = _decode_encoded_words.cache_info  # type: ignore[attr-defined]
+
+
+def _splitlines(block: AnyStr) -> list[AnyStr]:
+    """Split a block of lines terminated by CRLF (or LF) into a list of
+    lines without their terminators. The block can be bytes or a (decoded)
+    unicode string."""
+    if isinstance(block, str):
+        crlf, lf, cr = "\r\n", "\n", "\r"
+    else:
+        crlf, lf, cr = _CRLF, b"\n", b"\r"
+    lines = block.split(crlf)
+    if block.count(lf) == len(lines) - 1:
+        # Only CRLF terminators, the last item is the empty remainder
+        lines.pop()
+        return lines
+    lines = block.split(lf)
+    lines.pop()
+    return [line[:-1] if line.endswith(cr) else line for line in lines]
+
+
+def _unstuff(block: bytes) -> bytes:
+    """Undo the dot-stuffing of a block of lines: remove the leading "." of
+    the lines starting with ".."."""
+    block = block.replace(b"\n..", b"\n.")
+    return block[1:] if block.startswith(b"..") else block
+
+
+def _resp_class(resp: bytes) -> int:
+    """Return the class of the response line `resp`, as one of the _RESP_*
+    constants."""
+    if len(resp) >= 3 and resp[:3].isdigit():
+        return _CODE_CLASS[(resp[0] - 48) * 100 + (resp[1] - 48) * 10 + resp[2] - 48]
+    # Not a response number; only the first digit tells something
+    if not resp:
+        return _RESP_OK
+    c = resp[0] - 48
+    return _DIGIT_CLASS[c] if 0 <= c <= 9 else _RESP_PROTO_ERR
+
+
 def _parse_overview_fmt(lines: list[str]) -> list[str]:
     """Parse a list of string representing the response to LIST OVERVIEW.FMT
     and return a list of header/metadata names.
@@ -30,7 +130,7 @@ def _parse_overview_fmt(lines: list[str]) -> list[str]:
     (cf. RFC 3977, section 8.4)."""
     fmt = []
     for line in lines:
-        if line[0] == ":":
+        if line.startswith(":"):
             # Metadata name (e.g. ":bytes")
             name, _, suffix = line[1:].partition(":")
             name = ":" + name
@@ -38,66 +138,85 @@ def _parse_overview_fmt(lines: list[str]) -> list[str]:
             # Header name (e.g. "Subject:" or "Xref:full")
             name, _, suffix = line.partition(":")
         name = name.lower()
-        name = _OVERVIEW_FMT_ALTERNATIVES.get(name, name)
+        name = _OVERVIEW_FMT_NORMALIZE(name, name)
         # Should we do something with the suffix?
         fmt.append(name)
     defaults = _DEFAULT_OVERVIEW_FMT
     if len(fmt) < len(defaults):
         raise NNTPDataError("LIST OVERVIEW.FMT response too short")
-    if fmt[: len(defaults)] != defaults:
+    if tuple(fmt[: len(defaults)]) != defaults:
         raise NNTPDataError("LIST OVERVIEW.FMT redefines default fields")
     return fmt
 
 
-def _parse_overview(lines: list[str], fmt: list[str]) -> list[tuple[int, dict[str, Any]]]:
-    """Parse the response to an OVER or XOVER command according to the
-    overview format `fmt`."""
+def _compile_overview_fmt(fmt: list[str]) -> tuple[tuple[int, str, str, int], ...]:
+    """Return the per-format work of _parse_overview, to be done once for
+    all the OVER or XOVER responses using the overview format `fmt`."""
     n_defaults = len(_DEFAULT_OVERVIEW_FMT)
+    # Non-default header names are included in full in the response (unless
+    # the field is totally empty): (index, name, "name: ", prefix length)
+    # for those fields
+    return tuple(
+        (i, name, name + ": ", len(name) + 2)
+        for i, name in enumerate(fmt)
+        if i >= n_defaults and not name.startswith(":")
+    )
+
+
+def _parse_overview(
+    lines: list[str], fmt: list[str], headers: tuple[tuple[int, str, str, int], ...] | None = None
+) -> list[tuple[int, dict[str, Any]]]:
+    """Parse the response to an OVER or XOVER command according to the
+    overview format `fmt`.  `headers` is _compile_overview_fmt(fmt), if
+    the caller has it already."""
+    if not lines:
+        return []
+    if headers is None:
+        headers = _compile_overview_fmt(fmt)
+    n_fmt = len(fmt)
     overview = []
+    append = overview.append
     for line in lines:
-        fields = {}
         article_number, *tokens = line.split("\t")
-        article_number = int(article_number)
-        for i, token in enumerate(tokens):
-            if i >= len(fmt):
-                # XXX should we raise an error? Some servers might not
-                # support LIST OVERVIEW.FMT and still return additional
-                # headers.
-                continue
-            field_name = fmt[i]
-            is_metadata = field_name.startswith(":")
-            if i >= n_defaults and not is_metadata:
-                # Non-default header names are included in full in the response
-                # (unless the field is totally empty)
-                h = field_name + ": "
-                if token and token[: len(h)].lower() != h:
-                    raise NNTPDataError("OVER/XOVER response doesn't include " "names of additional headers")
-                token = token[len(h) :] if token else None
-            fields[fmt[i]] = token
-        overview.append((article_number, fields))
+        # XXX should we raise an error on additional tokens? Some servers
+        # might not support LIST OVERVIEW.FMT and still return additional
+        # headers. zip() ignores them.
+        fields = dict(zip(fmt, tokens))
+        line_headers = headers
+        if len(tokens) < n_fmt:
+            # Short line: only look at the header fields it has
+            line_headers = [h for h in headers if h[0] < len(tokens)]
+        for i, name, prefix, n in line_headers:
+            token = tokens[i]
+            if token:
+                if token[:n].lower() != prefix:
+                    raise NNTPDataError("OVER/XOVER response doesn't include names of additional headers")
+                fields[name] = token[n:]
+            else:
+                fields[name] = None
+        append((int(article_number), fields))
     return overview
 
 
-def _parse_datetime(date_str: str, time_str: str | None = None) -> datetime.datetime:
+def _parse_datetime(date_str: str | bytes, time_str: str | bytes | None = None) -> datetime.datetime:
     """Parse a pair of (date, time) strings, and return a datetime object.
     If only the date is given, it is assumed to be date and time
     concatenated together (e.g. response to the DATE command).
+    The strings can also be bytes, such as the raw DATE response.
     """
+    # Split the fields arithmetically rather than converting each slice
     if time_str is None:
-        time_str = date_str[-6:]
-        date_str = date_str[:-6]
-    hours = int(time_str[:2])
-    minutes = int(time_str[2:4])
-    seconds = int(time_str[4:])
-    year = int(date_str[:-4])
-    month = int(date_str[-4:-2])
-    day = int(date_str[-2:])
+        year, time = divmod(int(date_str), 1000000)
+    else:
+        year, time = int(date_str), int(time_str)
+    year, month = divmod(year, 10000)
+    month, day = divmod(month, 100)
+    hours, minutes = divmod(time, 10000)
+    minutes, seconds = divmod(minutes, 100)
     # RFC 3977 doesn't say how to interpret 2-char years.  Assume that
     # there are no dates before 1970 on Usenet.
-    if year < 70:
-        year += 2000
-    elif year < 100:
-        year += 1900
+    if year < 100:
+        year += 2000 if year < 70 else 1900
     return datetime.datetime(year, month, day, hours, minutes, seconds)
 
 
@@ -117,24 +236,158 @@ def _unparse_datetime(dt: datetime.datetime, legacy: bool = False) -> tuple[str,
     if not isinstance(dt, datetime.datetime):
         time_str = "000000"
     else:
-        time_str = "{0.hour:02d}{0.minute:02d}{0.second:02d}".format(dt)
+        time_str = f"{dt.hour:02d}{dt.minute:02d}{dt.second:02d}"
     y = dt.year
     if legacy:
         y = y % 100
-        date_str = "{0:02d}{1.month:02d}{1.day:02d}".format(y, dt)
+        date_str = f"{y:02d}{dt.month:02d}{dt.day:02d}"
     else:
-        date_str = "{0:04d}{1.month:02d}{1.day:02d}".format(y, dt)
+        date_str = f"{y:04d}{dt.month:02d}{dt.day:02d}"
     return date_str, time_str
 
 
-def _encrypt_on(sock: socket.socket, context: ssl.SSLContext, hostname: str) -> ssl.SSLSocket:
+@functools.lru_cache(maxsize=1)
+def _get_netrc() -> netrc.netrc:
+    """Return the parsed ~/.netrc file, read once per process. Raises
+    OSError if there is none (and tries again on the next call)."""
+    import netrc
+
+    return netrc.netrc()
+
+
+@functools.lru_cache(maxsize=None)
+def _default_ssl_context() -> ssl.SSLContext:
+    """Return the SSL context used when none is given. It is created once
+    and shared by all connections, as creating one is comparatively slow."""
+    return ssl._create_stdlib_context()
+
+
+def _encrypt_on(
+    sock: socket.socket, context: ssl.SSLContext, hostname: str, session: ssl.SSLSession | None = None
+) -> ssl.SSLSocket:
     """Wrap a socket in SSL/TLS. Arguments:
     - sock: Socket to wrap
     - context: SSL context to use for the encrypted connection
+    - session: TLS session of an earlier connection with the same context,
+               to resume instead of doing a full handshake
     Returns:
     - sock: New, encrypted socket.
     """
     # Generate a default SSL context if none was passed.
     if context is None:
-        context = ssl._create_stdlib_context()
-    return context.wrap_socket(sock, server_hostname=hostname)
+        context = _default_ssl_context()
+    return context.wrap_socket(sock, server_hostname=hostname, session=session)
+
+
+def _check_line_lengths(buf: bytes | bytearray, start: int, end: int) -> None:
+    """Raise NNTPDataError if one of the lines in buf[start:end], which
+    ends with a line terminator, is longer than _MAXLINE (terminator
+    included)."""
+    # Jump from line to line in steps of up to _MAXLINE bytes, rather than
+    # visiting every line
+    while end - start > _MAXLINE:
+        start = buf.rfind(b"\n", start, start + _MAXLINE) + 1
+        if not start:
+            raise NNTPDataError("line too long")
+
+
+class _LineReader:
+    """Buffered reader returning lines received through `recv_into`, a
+    callable with the signature of socket.recv_into().
+    Data is received `chunk_size` bytes at a time and lines are sliced out
+    of the buffer, instead of issuing a system call for every line."""
+
+    def __init__(self, recv_into: Callable[[memoryview], int], chunk_size: int = NNTP_RECV_CHUNK) -> None:
+        self._recv_into = recv_into
+        self._chunk = memoryview(bytearray(chunk_size))
+        self.buf = bytearray()
+        self.pos = 0
+
+    def _fill(self) -> int:
+        """Drop the consumed part of the buffer and append one chunk to it.
+        Returns the number of bytes received, 0 meaning end of file."""
+        # Deleting from the front of a bytearray only moves its start offset.
+        del self.buf[: self.pos]
+        self.pos = 0
+        n = self._recv_into(self._chunk)
+        self.buf += self._chunk[:n]
+        return n
+
+    def readline(self, strip: bool = False) -> bytes:
+        """Return the next line, without its CRLF (or LF) terminator if
+        `strip` is true. Raise NNTPDataError if the line is longer than
+        _MAXLINE and EOFError if the connection is closed."""
+        buf = self.buf
+        # A single-byte needle lets find() use memchr()
+        end = buf.find(b"\n", self.pos) + 1
+        while not end:
+            scanned = len(buf) - self.pos
+            if scanned > _MAXLINE:
+                raise NNTPDataError("line too long")
+            if not self._fill():
+                if not scanned:
+                    raise EOFError
+                end = len(buf)
+                break
+            end = buf.find(b"\n", scanned) + 1
+        start = self.pos
+        if end - start > _MAXLINE:
+            raise NNTPDataError("line too long")
+        self.pos = end
+        if strip and buf[end - 1] == 0x0A:
+            end -= 2 if end - start > 1 and buf[end - 2] == 0x0D else 1
+        return bytes(buf[start:end])
+
+    def iterblock(self) -> Iterator[bytes]:
+        """Yield the data block of a multi-line response, i.e. all the lines
+        up to the one consisting of a single ".", which is consumed but not
+        returned. The block comes in pieces of whole lines, as they are
+        received, so that it is never held in memory at once. Lines are
+        left untouched (terminators, dot-stuffing).
+        Raise NNTPDataError if a line is longer than _MAXLINE and EOFError
+        if the connection is closed before the block ends."""
+        buf = self.buf
+        while True:
+            # At the start of a line
+            start = self.pos
+            head = buf[start : start + 3]
+            if head == b".\r\n" or head[:2] == b".\n":
+                self.pos = start + 3 if head == b".\r\n" else start + 2
+                return
+            if len(head) < 3 and b".\r\n".startswith(head):
+                # Could still be the terminating line
+                if not self._fill():
+                    raise EOFError
+                continue
+            # Look for a "." line ending with CRLF or LF alike, in a single
+            # scan; other lines starting with "." are dot-stuffed
+            size = len(buf)
+            nl = buf.find(b"\n.", start)
+            while 0 <= nl < size - 2:
+                after = buf[nl + 2]
+                if after == 0x0A or (after == 0x0D and nl + 3 < size and buf[nl + 3] == 0x0A):
+                    dot = nl + 1
+                    _check_line_lengths(buf, start, dot)
+                    self.pos = dot + (2 if after == 0x0A else 3)
+                    yield bytes(buf[start:dot])
+                    return
+                if after == 0x0D and nl + 3 == size:
+                    # Received up to ".\r": left to the next round
+                    break
+                nl = buf.find(b"\n.", nl + 2)
+            # Hand out the lines received so far; a terminator split across
+            # chunks then starts the rest of the buffer
+            complete = buf.rfind(b"\n", start) + 1
+            if complete:
+                _check_line_lengths(buf, start, complete)
+                self.pos = complete
+                yield bytes(buf[start:complete])
+            if len(buf) - self.pos > _MAXLINE:
+                raise NNTPDataError("line too long")
+            if not self._fill():
+                raise EOFError
+
+    def readblock(self) -> bytes:
+        """Return the whole data block of a multi-line response, as
+        iterblock() yields it."""
+        return b"".join(self.iterblock())
@@ -1,3 +1,4 @@
+import asyncio
 import contextlib
 import datetime
 import functools
@@ -6,6 +7,8 @@ import os.path
 import re
 import socket
 import ssl
+import subprocess
+import sys
 import textwrap
 import threading
 import unittest
@@ -13,6 +16,8 @@ from test import support
 from test.support import socket_helper
 from unittest.mock import patch
 
+from nntp import _async as nntp_async
+from nntp import _constants, _helpers
 from nntp import _core as nntp
 from nntp._core import NNTP
 from nntp._types import GroupInfo
@@ -272,7 +277,7 @@ class NetworkedNNTPTestsMixin:
 
     def test_with_statement(self):
         def is_connected():
-            if not hasattr(server, "file"):
+            if not hasattr(server, "_sendall"):
                 return False
             try:
                 server.help()
@@ -436,12 +441,20 @@ def make_mock_file(handler):
 class NNTPServer(nntp.NNTP):
     def __init__(self, f, host, readermode=None):
         self.file = f
+        self._sendall = self._sendall_file
+        self._reader = nntp._LineReader(f.readinto)
         self.host = host
+        self.port = nntp.NNTP_PORT
         self._base_init(readermode)
 
+    def _sendall_file(self, data):
+        self.file.write(data)
+        self.file.flush()
+
     def _close(self):
         self.file.close()
         del self.file
+        del self._sendall
 
 
 class MockedNNTPTestsMixin:
@@ -450,6 +463,10 @@ class MockedNNTPTestsMixin:
 
     def setUp(self):
         super().setUp()
+        # Don't share overview formats between the different handlers
+        p = patch.dict(nntp.NNTP._overview_fmt_cache, clear=True)
+        p.start()
+        self.addCleanup(p.stop)
         self.make_server()
 
     def tearDown(self):
@@ -941,6 +958,21 @@ class NNTPv1v2TestsMixin:
             self.server.stat()
         self.assertEqual(cm.exception.response, "412 No newsgroup selected")
 
+    def test_pipeline(self):
+        with self.server.pipeline() as p:
+            p.shortcmd("STAT 3000234")
+            p.longcmd("BODY 3000234")
+            p.shortcmd("STAT <non.existent.id>")
+            p.shortcmd("DATE")
+        self.assertEqual(len(p.responses), 4)
+        self.assertEqual(p.responses[0], "223 3000234 <45223423@example.com>")
+        resp, lines = p.responses[1]
+        self.assertEqual(resp, "222 3000234 <45223423@example.com>")
+        self._check_article_body(lines)
+        self.assertIsInstance(p.responses[2], nntp.NNTPTemporaryError)
+        self.assertEqual(p.responses[2].response, "430 No Such Article Found")
+        self.assertEqual(p.responses[3], "111 20100914001155")
+
     def test_next(self):
         resp, art_num, message_id = self.server.next()
         self.assertEqual(resp, "223 3000237 <668929@example.org> retrieved")
@@ -1324,9 +1356,15 @@ class NNTPv1Tests(NNTPv1v2TestsMixin, MockedNNTPTestsMixin, unittest.TestCase):
     def test_caps(self):
         caps = self.server.getcapabilities()
         self.assertEqual(caps, {})
+        self.assertEqual(self.server._caps_set, frozenset())
         self.assertEqual(self.server.nntp_version, 1)
         self.assertEqual(self.server.nntp_implementation, None)
 
+    def test_overview_fmt_not_cached(self):
+        # Without an IMPLEMENTATION capability, the server isn't identified
+        self.server._getoverviewfmt()
+        self.assertEqual(nntp.NNTP._overview_fmt_cache, {})
+
 
 class NNTPv2Tests(NNTPv1v2TestsMixin, MockedNNTPTestsMixin, unittest.TestCase):
     """Tests an NNTP v2 server (with capabilities)."""
@@ -1356,9 +1394,25 @@ class NNTPv2Tests(NNTPv1v2TestsMixin, MockedNNTPTestsMixin, unittest.TestCase):
                 "READER": [],
             },
         )
+        self.assertEqual(self.server._caps_set, frozenset(caps))
         self.assertEqual(self.server.nntp_version, 3)
         self.assertEqual(self.server.nntp_implementation, "INN 2.5.1")
 
+    def test_overview_fmt_cache(self):
+        fmt = self.server._getoverviewfmt()
+        key = ("test.server", nntp.NNTP_PORT, "INN 2.5.1", 3)
+        self.assertIs(nntp.NNTP._overview_fmt_cache[key], fmt)
+        # A new connection to the same server doesn't ask again
+        server = self.make_server()
+        self.assertIs(server._getoverviewfmt(), fmt)
+
+    def test_overview_schema(self):
+        fmt, headers = self.server._getoverviewschema()
+        self.assertIs(fmt, self.server._getoverviewfmt())
+        self.assertEqual(headers, _helpers._compile_overview_fmt(fmt))
+        # Compiled once per connection
+        self.assertIs(self.server._getoverviewschema()[1], headers)
+
 
 class CapsAfterLoginNNTPv2Tests(MockedNNTPTestsMixin, unittest.TestCase):
     """Tests a probably NNTP v2 server with capabilities only after login."""
@@ -1384,25 +1438,71 @@ class SendReaderNNTPv2Tests(MockedNNTPWithReaderModeMixin, unittest.TestCase):
 
 
 class MiscTests(unittest.TestCase):
-    def test_decode_header(self):
-        def gives(a, b):
-            self.assertEqual(nntp.decode_header(a), b)
-
-        gives("", "")
-        gives("a plain header", "a plain header")
-        gives(" with extra  spaces ", " with extra  spaces ")
-        gives("=?ISO-8859-15?Q?D=E9buter_en_Python?=", "Débuter en Python")
-        gives(
+    DECODE_HEADER_VECTORS = [
+        ("", ""),
+        ("a plain header", "a plain header"),
+        (" with extra  spaces ", " with extra  spaces "),
+        ("=?ISO-8859-15?Q?D=E9buter_en_Python?=", "Débuter en Python"),
+        (
             "=?utf-8?q?Re=3A_=5Bsqlite=5D_probl=C3=A8me_avec_ORDER_BY_sur_des_cha?="
             " =?utf-8?q?=C3=AEnes_de_caract=C3=A8res_accentu=C3=A9es?=",
             "Re: [sqlite] problème avec ORDER BY sur des chaînes de caractères accentuées",
-        )
-        gives("Re: =?UTF-8?B?cHJvYmzDqG1lIGRlIG1hdHJpY2U=?=", "Re: problème de matrice")
+        ),
+        ("Re: =?UTF-8?B?cHJvYmzDqG1lIGRlIG1hdHJpY2U=?=", "Re: problème de matrice"),
+        # Empty encoded words
+        ("=?utf-8?q??=", ""),
+        ("=?utf-8?q??= ", " "),
+        ("Re: =?utf-8?b??=", "Re: "),
         # A natively utf-8 header (found in the real world!)
-        gives(
+        (
             "Re: Message d'erreur incompréhensible (par moi)",
             "Re: Message d'erreur incompréhensible (par moi)",
-        )
+        ),
+        # Encoded words touching each other or other text
+        ("=?utf-8?q?a?==?utf-8?q?b?=", "ab"),
+        ("=?iso-8859-1?q?=E9?==?utf-8?q?=C3=A9?=", "éé"),
+        ("x=?utf-8?q?a?=", "xa"),
+        ("=?UTF-8?B?w6k=?=x", "éx"),
+        # Invalid UTF-8
+        ("=?utf-8?q?=FF?=", UnicodeDecodeError),
+    ]
+
+    def check_decode_header(self, a, b):
+        if isinstance(b, str):
+            self.assertEqual(nntp.decode_header(a), b)
+        else:
+            self.assertRaises(b, nntp.decode_header, a)
+
+    def test_decode_header(self):
+        for a, b in self.DECODE_HEADER_VECTORS:
+            with self.subTest(header=a):
+                self.check_decode_header(a, b)
+
+    @unittest.skipUnless(_helpers._USE_FAST_PARSER, "requires fast_mail_parser")
+    def test_decode_header_fast_parser(self):
+        nntp.decode_header.cache_clear()
+        self.addCleanup(nntp.decode_header.cache_clear)
+        for a, b in self.DECODE_HEADER_VECTORS:
+            with self.subTest(header=a):
+                if "=?" in a and isinstance(b, str) and _helpers._FAST_PARSER_MATCH(a):
+                    # Encoded words must be decoded by fast_mail_parser alone
+                    with patch.object(_helpers, "_email_decode_header", side_effect=AssertionError):
+                        self.check_decode_header(a, b)
+                else:
+                    self.check_decode_header(a, b)
+
+    def test_decode_header_cache(self):
+        nntp.decode_header.cache_clear()
+        self.addCleanup(nntp.decode_header.cache_clear)
+        header = "=?ISO-8859-15?Q?D=E9buter_en_Python?="
+        self.assertEqual(nntp.decode_header(header), "Débuter en Python")
+        self.assertEqual(nntp.decode_header(header), "Débuter en Python")
+        self.assertEqual(nntp.decode_header.cache_info().hits, 1)
+        # Headers without encoded words never reach the cache
+        self.assertEqual(nntp.decode_header("a plain header"), "a plain header")
+        self.assertEqual(nntp.decode_header.cache_info().currsize, 1)
+        nntp.decode_header.cache_clear()
+        self.assertEqual(nntp.decode_header.cache_info().currsize, 0)
 
     def test_parse_overview_fmt(self):
         # The minimal (default) response
@@ -1523,9 +1623,12 @@ class MiscTests(unittest.TestCase):
                 "xref",
             ],
         )
+        # An empty line is a bad field name, not a crash
+        lines = ["", "From:", "Date:", "Message-ID:", "References:", ":bytes", ":lines"]
+        self.assertRaises(nntp.NNTPDataError, nntp._parse_overview_fmt, lines)
 
     def test_parse_overview(self):
-        fmt = nntp._DEFAULT_OVERVIEW_FMT + ["xref"]
+        fmt = [*nntp._DEFAULT_OVERVIEW_FMT, "xref"]
         # First example from RFC 3977
         lines = [
             '3000234\tI am just a test article\t"Demo User" '
@@ -1572,10 +1675,21 @@ class MiscTests(unittest.TestCase):
         ((art_num, fields),) = overview
         self.assertEqual(fields["references"], " ")
         self.assertEqual(fields["xref"], "")
+        # Fourth example; the line stops before the "Xref" field
+        lines = [
+            '3000234\tI am just a test article\t"Demo User" '
+            "<nobody@example.com>\t6 Oct 1998 04:38:40 -0500\t"
+            "<45223423@example.com>\t<45454@example.net>\t1234\t17",
+        ]
+        overview = nntp._parse_overview(lines, fmt)
+        ((art_num, fields),) = overview
+        self.assertEqual(fields[":lines"], "17")
+        self.assertNotIn("xref", fields)
+        self.assertEqual(nntp._parse_overview([], fmt), [])
 
     def test_parse_datetime(self):
         def gives(a, b, *c):
-            self.assertEqual(nntp._parse_datetime(a, b), datetime.datetime(*c))
+            self.assertEqual(_helpers._parse_datetime(a, b), datetime.datetime(*c))
 
         # Output of DATE command
         gives("19990623135624", None, 1999, 6, 23, 13, 56, 24)
@@ -1583,6 +1697,18 @@ class MiscTests(unittest.TestCase):
         gives("19990623", "135624", 1999, 6, 23, 13, 56, 24)
         gives("990623", "135624", 1999, 6, 23, 13, 56, 24)
         gives("090623", "135624", 2009, 6, 23, 13, 56, 24)
+        # Raw DATE response
+        gives(b"19990623135624", None, 1999, 6, 23, 13, 56, 24)
+        # Every field at its widest
+        gives(b"20101231235959", None, 2010, 12, 31, 23, 59, 59)
+        gives("20100101", "000000", 2010, 1, 1, 0, 0, 0)
+        # Date and time concatenated, with a 2-digit year
+        gives("990623135624", None, 1999, 6, 23, 13, 56, 24)
+        gives(b"090623135624", None, 2009, 6, 23, 13, 56, 24)
+        # 2-digit years pivot at 1970
+        gives("700101", "000000", 1970, 1, 1, 0, 0, 0)
+        gives("691231", "235959", 2069, 12, 31, 23, 59, 59)
+        gives("000101", "000000", 2000, 1, 1, 0, 0, 0)
 
     def test_unparse_datetime(self):
         # Test non-legacy mode
@@ -1626,10 +1752,147 @@ class MiscTests(unittest.TestCase):
         gives(2000, 6, 23, "000623", "000000")
         gives(2010, 6, 5, "100605", "000000")
 
+    def test_resp_class(self):
+        def gives(resp, resp_class):
+            self.assertEqual(nntp._resp_class(resp), resp_class)
+
+        gives(b"200 Welcome", _constants._RESP_OK)
+        gives(b"340 Send article", _constants._RESP_OK)
+        gives(b"100 Help follows", _constants._RESP_LONG)
+        gives(b"224 Overview follows", _constants._RESP_LONG)
+        gives(b"411 No such group", _constants._RESP_TEMP_ERR)
+        gives(b"502 Access denied", _constants._RESP_PERM_ERR)
+        gives(b"099 Huh", _constants._RESP_PROTO_ERR)
+        gives(b"600 Huh", _constants._RESP_PROTO_ERR)
+        gives(b"Huh", _constants._RESP_PROTO_ERR)
+        # Without a response number, only the first digit counts
+        gives(b"4xx", _constants._RESP_TEMP_ERR)
+        gives(b"10", _constants._RESP_OK)
+
     @unittest.skipUnless(ssl, "requires SSL support")
     def test_ssl_support(self):
         self.assertTrue(hasattr(nntp, "NNTP_SSL"))
 
+    @unittest.skipUnless(ssl, "requires SSL support")
+    def test_default_ssl_context(self):
+        context = _helpers._default_ssl_context()
+        self.assertIsInstance(context, ssl.SSLContext)
+        self.assertIs(_helpers._default_ssl_context(), context)
+
+
+class LineReaderTests(unittest.TestCase):
+    def make_reader(self, data, chunk_size=4):
+        # A tiny chunk size makes lines span several chunks
+        return nntp._LineReader(io.BytesIO(data).readinto, chunk_size)
+
+    def test_readline(self):
+        reader = self.make_reader(b"200 Welcome\r\nfoo\nbar")
+        self.assertEqual(reader.readline(), b"200 Welcome\r\n")
+        self.assertEqual(reader.readline(), b"foo\n")
+        self.assertEqual(reader.readline(), b"bar")
+        self.assertRaises(EOFError, reader.readline)
+
+    def test_readline_strip(self):
+        reader = self.make_reader(b"200 Welcome\r\n\r\nfoo\nbar\r\r\n\nbaz")
+        self.assertEqual(reader.readline(True), b"200 Welcome")
+        self.assertEqual(reader.readline(True), b"")
+        self.assertEqual(reader.readline(True), b"foo")
+        self.assertEqual(reader.readline(True), b"bar\r")
+        self.assertEqual(reader.readline(True), b"")
+        self.assertEqual(reader.readline(True), b"baz")
+        self.assertRaises(EOFError, reader.readline, True)
+
+    def test_readline_too_long(self):
+        reader = self.make_reader(b"x" * 2046 + b"\r\n" + b"x" * 2047 + b"\r\n", 1024)
+        self.assertEqual(len(reader.readline()), 2048)
+        self.assertRaises(nntp.NNTPDataError, reader.readline)
+
+    def test_readblock(self):
+        data = (
+            b"220 1 <a@b>\r\n"
+            b"Line 1\r\n"
+            b"..Stuffed\r\n"
+            b".\r\n"
+            b".\r\n"
+            b"\r\n"
+            b"Last.\r\n"
+            b".\r\n"
+            b"223 1 <a@b>\r\n"
+        )
+        for chunk_size in (1, 2, 3, 5, 1024):
+            with self.subTest(chunk_size=chunk_size):
+                reader = self.make_reader(data, chunk_size)
+                self.assertEqual(reader.readline(), b"220 1 <a@b>\r\n")
+                self.assertEqual(reader.readblock(), b"Line 1\r\n..Stuffed\r\n")
+                self.assertEqual(reader.readblock(), b"")
+                self.assertEqual(reader.readblock(), b"\r\nLast.\r\n")
+                self.assertEqual(reader.readline(), b"223 1 <a@b>\r\n")
+
+    def test_readblock_lf(self):
+        # Some servers terminate lines with LF only
+        reader = self.make_reader(b"foo\n..bar\n.\nbaz\n")
+        self.assertEqual(reader.readblock(), b"foo\n..bar\n")
+        self.assertEqual(reader.readline(), b"baz\n")
+        # The first terminating line wins, whatever its line ending
+        reader = self.make_reader(b"foo\n.\r\nbar\r\n.\n.\r\n")
+        self.assertEqual(reader.readblock(), b"foo\n")
+        self.assertEqual(reader.readblock(), b"bar\r\n")
+        self.assertEqual(reader.readblock(), b"")
+
+    def test_readblock_mixed_line_endings(self):
+        # A stored LF-only article relayed with a CRLF "." CRLF terminator
+        data = b"Subject: x\nbody\n..stuffed\n.\r\n223 1 <a@b>\r\n"
+        for chunk_size in (1, 2, 3, 5, 1024):
+            with self.subTest(chunk_size=chunk_size):
+                reader = self.make_reader(data, chunk_size)
+                self.assertEqual(reader.readblock(), b"Subject: x\nbody\n..stuffed\n")
+                self.assertEqual(reader.readline(), b"223 1 <a@b>\r\n")
+        reader = self.make_reader(b"Subject: x\r\nbody\r\n.\nafter\r\n")
+        self.assertEqual(reader.readblock(), b"Subject: x\r\nbody\r\n")
+        self.assertEqual(reader.readline(), b"after\r\n")
+
+    def test_iterblock(self):
+        # The block comes in pieces of whole lines, as chunks are received
+        block = b"Line 1\r\n..Stuffed\r\n" + b"x" * 20 + b"\r\n"
+        reader = self.make_reader(block + b".\r\nafter\r\n", 8)
+        pieces = list(reader.iterblock())
+        self.assertGreater(len(pieces), 1)
+        self.assertEqual(b"".join(pieces), block)
+        for piece in pieces:
+            self.assertTrue(piece.endswith(b"\r\n"), piece)
+        self.assertEqual(reader.readline(), b"after\r\n")
+
+    def test_readblock_eof(self):
+        reader = self.make_reader(b"foo\r\nbar\r\n")
+        self.assertRaises(EOFError, reader.readblock)
+
+    def test_readblock_too_long_line(self):
+        # Wherever the chunk boundaries fall
+        for chunk_size in (1024, 4096, 65536, nntp.NNTP_RECV_CHUNK):
+            with self.subTest(chunk_size=chunk_size):
+                reader = self.make_reader(b"x" * 10000 + b"\r\n.\r\n", chunk_size)
+                self.assertRaises(nntp.NNTPDataError, reader.readblock)
+                reader = self.make_reader(b"short\r\n" + b"x" * 10000 + b"\r\n.\r\n", chunk_size)
+                self.assertRaises(nntp.NNTPDataError, reader.readblock)
+                reader = self.make_reader(b"short\r\n" + b"x" * 2047 + b"\r\n.\r\n", chunk_size)
+                self.assertRaises(nntp.NNTPDataError, reader.readblock)
+                # The limit includes the line terminator
+                data = b"short\r\n" + b"x" * 2046 + b"\r\n"
+                reader = self.make_reader(data * 3 + b".\r\n", chunk_size)
+                self.assertEqual(reader.readblock(), data * 3)
+
+    def test_unstuff(self):
+        self.assertEqual(nntp._unstuff(b""), b"")
+        self.assertEqual(nntp._unstuff(b"..a\r\n.b\r\n...c\r\n"), b".a\r\n.b\r\n..c\r\n")
+        self.assertEqual(nntp._unstuff(b"a..\n..\n"), b"a..\n.\n")
+
+    def test_splitlines(self):
+        self.assertEqual(nntp._splitlines(b""), [])
+        self.assertEqual(nntp._splitlines(b"a\r\n\r\nb\r\n"), [b"a", b"", b"b"])
+        self.assertEqual(nntp._splitlines(b"a\n\r\nb\r\r\n"), [b"a", b"", b"b\r"])
+        self.assertEqual(nntp._splitlines(""), [])
+        self.assertEqual(nntp._splitlines("a\r\n\u2028\r\nb\n"), ["a", "\u2028", "b"])
+
 
 class PublicAPITests(unittest.TestCase):
     """Ensures that the correct values are exposed in the public API."""
@@ -1658,6 +1921,47 @@ class MockSocketTests(unittest.TestCase):
 
     nntp_class = nntp.NNTP
 
+    def mock_socket_module(self, handler_class):
+        """Return a stand-in for the socket module whose connections are
+        answered by `handler_class`, and the list of sockets it creates."""
+
+        class mock_socket_module:
+            IPPROTO_TCP = socket.IPPROTO_TCP
+            TCP_NODELAY = socket.TCP_NODELAY
+            SOL_SOCKET = socket.SOL_SOCKET
+            SO_RCVBUF = socket.SO_RCVBUF
+            SO_SNDBUF = socket.SO_SNDBUF
+
+            def create_connection(address, timeout):
+                return MockSocket()
+
+        if hasattr(socket, "TCP_USER_TIMEOUT"):
+            mock_socket_module.TCP_USER_TIMEOUT = socket.TCP_USER_TIMEOUT
+
+        class MockSocket:
+            def __init__(socket):
+                _, socket.file = make_mock_file(handler_class())
+                socket.closed = False
+                socket.options = []
+                sockets.append(socket)
+
+            def close(socket):
+                socket.closed = True
+                socket.file.close()
+
+            def setsockopt(socket, level, optname, value):
+                socket.options.append((level, optname, value))
+
+            def sendall(socket, data):
+                socket.file.write(data)
+                socket.file.flush()
+
+            def recv_into(socket, buffer):
+                return socket.file.readinto(buffer)
+
+        sockets = []
+        return mock_socket_module, sockets
+
     def check_constructor_error_conditions(
         self,
         handler_class,
@@ -1666,30 +1970,91 @@ class MockSocketTests(unittest.TestCase):
         login=None,
         password=None,
     ):
-        class mock_socket_module:
-            def create_connection(address, timeout):
-                return MockSocket()
-
-        class MockSocket:
-            def close(self):
-                nonlocal socket_closed
-                socket_closed = True
-
-            def makefile(socket, mode):
-                handler = handler_class()
-                _, file = make_mock_file(handler)
-                files.append(file)
-                return file
-
-        socket_closed = False
-        files = []
+        mock_socket_module, sockets = self.mock_socket_module(handler_class)
         with patch("nntp._core.socket", mock_socket_module), self.assertRaisesRegex(
             expected_error_type, expected_error_msg
         ):
             self.nntp_class("dummy", user=login, password=password)
-        self.assertTrue(socket_closed)
-        for f in files:
-            self.assertTrue(f.closed)
+        self.assertTrue(sockets)
+        for sock in sockets:
+            self.assertTrue(sock.closed)
+            self.assertTrue(sock.file.closed)
+
+    def test_bad_chunk_size(self):
+        # Checked before connecting
+        for chunk_size in (0, nntp.NNTP_RECV_CHUNK_MIN - 1, nntp.NNTP_RECV_CHUNK_MAX + 1):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertRaises(ValueError, self.nntp_class, "dummy", chunk_size=chunk_size)
+
+    def test_tcp_user_timeout(self):
+        mock_socket_module, sockets = self.mock_socket_module(NNTPv1Handler)
+        with patch("nntp._core.socket", mock_socket_module):
+            self.nntp_class("dummy", timeout=2.5)
+            self.nntp_class("dummy")
+            # Platforms without TCP_USER_TIMEOUT
+            if hasattr(mock_socket_module, "TCP_USER_TIMEOUT"):
+                del mock_socket_module.TCP_USER_TIMEOUT
+            self.nntp_class("dummy", timeout=2.5)
+        nodelay = (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if hasattr(socket, "TCP_USER_TIMEOUT"):
+            user_timeout = (socket.IPPROTO_TCP, socket.TCP_USER_TIMEOUT, 2500)
+            self.assertEqual(sockets[0].options, [nodelay, user_timeout])
+        else:
+            self.assertEqual(sockets[0].options, [nodelay])
+        self.assertEqual(sockets[1].options, [nodelay])
+        self.assertEqual(sockets[2].options, [nodelay])
+
+    def test_socket_options(self):
+        mock_socket_module, sockets = self.mock_socket_module(NNTPv1Handler)
+        with patch("nntp._core.socket", mock_socket_module):
+            self.nntp_class("dummy", nodelay=False)
+            self.nntp_class("dummy", nodelay=False, rcvbuf=1 << 20, sndbuf=1 << 16)
+            self.nntp_class("dummy", rcvbuf=1 << 20)
+        nodelay = (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        rcvbuf = (socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+        sndbuf = (socket.SOL_SOCKET, socket.SO_SNDBUF, 1 << 16)
+        # Buffer sizes are left to the operating system unless given
+        self.assertEqual(sockets[0].options, [])
+        self.assertEqual(sockets[1].options, [rcvbuf, sndbuf])
+        self.assertEqual(sockets[2].options, [nodelay, rcvbuf])
+
+    def netrc_login_handler(self, logins):
+        """Return a handler class recording the AUTHINFO commands it gets."""
+
+        class Handler(NNTPv1Handler):
+            def handle_AUTHINFO(self, cred_type, data):
+                logins.append((cred_type, data))
+                super().handle_AUTHINFO(cred_type, data)
+
+        return Handler
+
+    def test_netrc_read_once(self):
+        _helpers._get_netrc.cache_clear()
+        self.addCleanup(_helpers._get_netrc.cache_clear)
+        logins = []
+        mock_socket_module, _ = self.mock_socket_module(self.netrc_login_handler(logins))
+        with patch("nntp._core.socket", mock_socket_module), patch("netrc.netrc") as mock_netrc:
+            mock_netrc.return_value.authenticators.return_value = ("t@e.com", None, "python")
+            self.nntp_class("dummy", usenetrc=True)
+            self.nntp_class("dummy", usenetrc=True)
+        self.assertEqual(mock_netrc.call_count, 1)
+        self.assertEqual(logins, [("user", "t@e.com"), ("pass", "python")] * 2)
+
+    def test_netrc_missing_retried(self):
+        # A missing ~/.netrc is looked for again on the next login
+        _helpers._get_netrc.cache_clear()
+        self.addCleanup(_helpers._get_netrc.cache_clear)
+        logins = []
+        mock_socket_module, _ = self.mock_socket_module(self.netrc_login_handler(logins))
+        with patch("nntp._core.socket", mock_socket_module), patch("netrc.netrc") as mock_netrc:
+            mock_netrc.side_effect = FileNotFoundError
+            self.nntp_class("dummy", usenetrc=True)
+            self.assertEqual(logins, [])
+            mock_netrc.side_effect = None
+            mock_netrc.return_value.authenticators.return_value = ("t@e.com", None, "python")
+            self.nntp_class("dummy", usenetrc=True)
+        self.assertEqual(mock_netrc.call_count, 2)
+        self.assertEqual(logins, [("user", "t@e.com"), ("pass", "python")])
 
     def test_bad_welcome(self):
         # Test a bad welcome message
@@ -1757,6 +2122,27 @@ class MockSslTests(MockSocketTests):
     def nntp_class(*pos, **kw):
         return nntp.NNTP_SSL(*pos, ssl_context=bypass_context, **kw)
 
+    def test_tls_session_reuse(self):
+        class context:
+            def wrap_socket(sock, server_hostname, session):
+                resumed.append(session)
+                sock.session = object()
+                return sock
+
+        resumed = []
+        mock_socket_module, _ = self.mock_socket_module(NNTPv1Handler)
+        with patch.dict(nntp.NNTP_SSL._tls_sessions, clear=True), patch(
+            "nntp._core.socket", mock_socket_module
+        ):
+            first = nntp.NNTP_SSL("dummy", ssl_context=context)
+            second = nntp.NNTP_SSL("dummy", ssl_context=context)
+            # Sessions are only resumed with the context that made them
+            nntp.NNTP_SSL("dummy", ssl_context=bypass_context)
+            nntp.NNTP_SSL("other", ssl_context=context)
+            _, session = nntp.NNTP_SSL._tls_sessions["dummy", nntp.NNTP_SSL_PORT]
+            self.assertIs(session, second.sock.session)
+        self.assertEqual(resumed, [None, first.sock.session, None])
+
 
 class LocalServerTests(unittest.TestCase):
     def setUp(self):
@@ -1767,7 +2153,8 @@ class LocalServerTests(unittest.TestCase):
         self.background.start()
         self.addCleanup(self.background.join)
 
-        self.nntp = self.enterContext(NNTP(socket_helper.HOST, port, usenetrc=False))
+        self.nntp = NNTP(socket_helper.HOST, port, usenetrc=False)
+        self.addCleanup(self.nntp.__exit__, None, None, None)
 
     def run_server(self, sock):
         # Could be generalized to handle more commands in separate methods
@@ -1800,20 +2187,113 @@ class LocalServerTests(unittest.TestCase):
                 else:
                     raise ValueError("Unexpected command {!r}".format(cmd))
 
+    def test_nodelay(self):
+        self.assertTrue(
+            self.nntp.sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY)
+        )
+
     @unittest.skipUnless(ssl, "requires SSL support")
     def test_starttls(self):
-        file = self.nntp.file
         sock = self.nntp.sock
         self.nntp.starttls()
-        # Check that the socket and internal pseudo-file really were
-        # changed.
-        self.assertNotEqual(file, self.nntp.file)
+        # Check that the socket really was changed.
         self.assertNotEqual(sock, self.nntp.sock)
+        self.assertEqual(self.nntp._sendall, self.nntp.sock.sendall)
         # Check that the new socket really is an SSL one
         self.assertIsInstance(self.nntp.sock, ssl.SSLSocket)
         # Check that trying starttls when it's already active fails.
         self.assertRaises(ValueError, self.nntp.starttls)
 
 
+class AsyncTests(unittest.IsolatedAsyncioTestCase):
+    # Long enough to go past the stream buffer limit
+    big_body = b"".join(b"line %d\r\n" % i for i in range(1000)) + b"..stuffed\r\n"
+
+    async def asyncSetUp(self):
+        server = await asyncio.start_server(self.handle, socket_helper.HOST, 0)
+        self.addAsyncCleanup(server.wait_closed)
+        self.addCleanup(server.close)
+        port = server.sockets[0].getsockname()[1]
+        self.nntp = await nntp_async.NNTP_Async.connect(socket_helper.HOST, port, limit=1024)
+        self.addAsyncCleanup(self.nntp.close)
+
+    async def handle(self, reader, writer):
+        writer.write(b"200 Server ready\r\n")
+        while cmd := await reader.readline():
+            if cmd == b"HELP\r\n":
+                writer.write(b"100 Legal commands\r\n  help\r\n..stuffed\r\n.\r\n")
+            elif cmd == b"HELP LF\r\n":
+                # Bare LF line endings
+                writer.write(b"100 Legal commands\n  help\nmore\n..stuffed\n.\n")
+            elif cmd == b"HELP MIXED\r\n":
+                # Mixed line endings, in both directions
+                writer.write(b"100 Legal commands\r\nhelp\n.\r\n")
+                writer.write(b"100 Legal commands\r\nhelp\r\n.\n")
+            elif cmd == b"HELP LONG\r\n":
+                writer.write(b"100 Legal commands\r\nhelp\r\n" + b"x" * 2047 + b"\r\n.\r\n")
+            elif cmd == b"LISTGROUP empty\r\n":
+                writer.write(b"211 0 0 0 empty\r\n.\r\n")
+            elif cmd == b"LISTGROUP one\r\n":
+                writer.write(b"211 1 1 1 one\r\n1\r\n.\r\n")
+            elif cmd == b"BODY 1\r\n":
+                writer.write(b"222 1 <a@b> body\r\n" + self.big_body + b".\r\n")
+            elif cmd == b"STAT 2\r\n":
+                writer.write(b"423 No such article\r\n")
+            elif cmd == b"DATE\r\n":
+                writer.write(b"111 20100605010203\r\n")
+            elif cmd == b"QUIT\r\n":
+                writer.write(b"205 Bye!\r\n")
+                break
+            else:
+                writer.write(b"500 What?\r\n")
+        writer.close()
+        await writer.wait_closed()
+
+    async def test_welcome(self):
+        self.assertEqual(self.nntp.welcome, "200 Server ready")
+
+    async def test_cmd(self):
+        self.assertEqual(await self.nntp.cmd("DATE"), "111 20100605010203")
+        with self.assertRaises(nntp.NNTPTemporaryError) as cm:
+            await self.nntp.cmd("STAT 2")
+        self.assertEqual(cm.exception.response, "423 No such article")
+        with self.assertRaises(nntp.NNTPReplyError):
+            await self.nntp.longcmd("DATE")
+
+    async def test_longcmd(self):
+        resp, lines = await self.nntp.longcmd("HELP")
+        self.assertEqual(resp, "100 Legal commands")
+        self.assertEqual(lines, [b"  help", b".stuffed"])
+        resp, lines = await asyncio.wait_for(self.nntp.longcmd("HELP LF"), 5)
+        self.assertEqual(lines, [b"  help", b"more", b".stuffed"])
+        resp, lines = await asyncio.wait_for(self.nntp.longcmd("HELP MIXED"), 5)
+        self.assertEqual(lines, [b"help"])
+        self.assertEqual(await self.nntp.getresp(long=True), "100 Legal commands")
+        lines = await asyncio.wait_for(self.nntp.read_multiline(), 5)
+        self.assertEqual(lines, [b"help"])
+        resp, lines = await self.nntp.longcmd("LISTGROUP empty")
+        self.assertEqual(lines, [])
+        resp, lines = await self.nntp.longcmd("LISTGROUP one")
+        self.assertEqual(lines, [b"1"])
+        resp, lines = await self.nntp.longcmd("BODY 1")
+        self.assertEqual(lines, self.big_body.replace(b"..", b".").split(b"\r\n")[:-1])
+        self.assertEqual(await self.nntp.cmd("DATE"), "111 20100605010203")
+
+    async def test_longcmd_too_long_line(self):
+        with self.assertRaises(nntp.NNTPDataError):
+            await self.nntp.longcmd("HELP LONG")
+
+    def test_no_blocking_client_import(self):
+        # The asyncio client doesn't need the blocking one
+        code = "import sys, nntp._async; assert 'nntp._core' not in sys.modules"
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        subprocess.run([sys.executable, "-c", code], env=env, check=True)
+
+    async def test_quit(self):
+        async with self.nntp:
+            pass
+        self.assertTrue(self.nntp.writer.is_closing())
+
+
 if __name__ == "__main__":
     unittest.main()